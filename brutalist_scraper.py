@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 import re
+import html
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+import lxml.html
+from scraping_helpers import stripped_text
 
 
 USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124 Safari/537.36"
@@ -13,52 +15,90 @@ USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Ge
 BASE_URL = "https://brutalist.report/topic/business"
 
 AGE_RE = re.compile(r"\[(\d+)\s*([mhd])\]")  # e.g., [19m], [1h], [3d]
+_UNIT = {"m": "minutes", "h": "hours", "d": "days"}  # AGE_RE unit -> timedelta keyword
+
+# The feed is a list of '<a href="...">title</a> [19m]': one pass over the raw HTML pulls out (href, title, age tag)
+_ITEM_RE = re.compile(r'<a\s[^>]*?(?<![\w-])href="([^"]+)"[^>]*>([^<]+)</a>\s*(\[\d+\s*[mhd]\])')
+MIN_REGEX_ITEMS = 3  # fewer matches than this means the markup changed, walk the DOM instead
+
+# One pooled session for the whole process: repeated scrapes reuse the same TLS connection.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+_SESSION.headers.update({"User-Agent": USER_AGENT})
+
+# (url, params) -> (etag, body) of the last 200 response, replayed when the server answers 304
+_PAGE_CACHE: dict[tuple, tuple[str, str]] = {}
+
+def get_with_etag(url: str, params: dict | None = None) -> str:
+    """GET a page through the shared session, sending If-None-Match so unchanged pages come back as 304."""
+    key = (url, tuple(sorted((params or {}).items())))
+    cached = _PAGE_CACHE.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    r = _SESSION.get(url, params=params, headers=headers, timeout=20)
+    if r.status_code == 304 and cached:
+        return cached[1]
+    r.raise_for_status()
+    etag = r.headers.get("ETag")
+    if etag:
+        _PAGE_CACHE[key] = (etag, r.text)
+    return r.text
 
 def is_external(href: str) -> bool:
-    try:
-        netloc = urlparse(href).netloc.lower()
-    except Exception:
-        return False
+    # plain string checks instead of urlparse: this runs for every anchor on the page
+    if not href or href[0] in "#?" or (href[0] == "/" and href[1:2] != "/"):
+        return False  # in-page anchors, query-only and site-relative links
+    lower = href.lower()
+    if not lower.startswith(("http://", "https://", "//")):
+        return False  # relative paths, mailto:, javascript:, ...
+    # "https://host/..." and "//host/..." both have the netloc as the third "/"-field
+    netloc = lower.split("/", 3)[2].split("?", 1)[0].split("#", 1)[0]
     return bool(netloc) and "brutalist.report" not in netloc
 
-def parse_age_to_timedelta(age_text: str) -> timedelta | None:
+def parse_age_to_timedelta(age_text: str) -> tuple[timedelta, str] | tuple[None, None]:
+    """Age as a timedelta plus the matched tag itself (e.g. "[19m]"), or (None, None) if there is no age tag."""
     m = AGE_RE.search(age_text)
     if not m:
-        return None
-    val = int(m.group(1))
-    unit = m.group(2)
-    if unit == "m":
-        return timedelta(minutes=val)
-    if unit == "h":
-        return timedelta(hours=val)
-    if unit == "d":
-        return timedelta(days=val)
-    return None
+        return None, None
+    return timedelta(**{_UNIT[m.group(2)]: int(m.group(1))}), m.group(0)
+
+def iter_candidates_regex(text: str):
+    """(href, title, age text) for every '<a href>title</a> [age]' in the raw HTML, no tree built at all."""
+    for m in _ITEM_RE.finditer(text):
+        yield html.unescape(m.group(1)).strip(), html.unescape(m.group(2)).strip(), m.group(3)
+
+def iter_candidates_tree(text: str):
+    """Same triples from the parsed page (the age is searched in the anchor's parent text): slower, layout-agnostic."""
+    tree = lxml.html.fromstring(text)
+    for a in tree.xpath("//a[@href]"):
+        title = stripped_text(a)
+        # Look for an age tag in the same line/container (parent text is usually "<title> [xx]")
+        parent = a.getparent()
+        parent_text = stripped_text(parent, " ") if parent is not None else title
+        yield a.get("href").strip(), title, parent_text
 
 def get_today_titles_brutalist(limit=10, today_tz="Europe/Paris"):
     params = {"limit": str(limit)}
-    r = requests.get(BASE_URL, params=params, headers={"User-Agent": USER_AGENT}, timeout=20)
-    r.raise_for_status()
+    text = get_with_etag(BASE_URL, params=params)
 
-    soup = BeautifulSoup(r.text, "lxml")
-    now = datetime.now(ZoneInfo(today_tz)).replace(tzinfo=ZoneInfo(today_tz))
+    tzinfo = ZoneInfo(today_tz)
+    now = datetime.now(tzinfo).replace(tzinfo=tzinfo)
     today_date = now.date()
 
     results = []
     seen = set()
 
+    candidates = list(iter_candidates_regex(text))
+    if len(candidates) < MIN_REGEX_ITEMS:
+        candidates = iter_candidates_tree(text)
+
     # Heuristic: headline anchors are external links, and the parent text includes an age tag like [19m].
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
+    for href, title, parent_text in candidates:
         if not is_external(href):
             continue
-        title = a.get_text(strip=True)
         if not title:
             continue
 
-        # Look for an age tag in the same line/container (parent text is usually "<title> [xx]")
-        parent_text = a.parent.get_text(" ", strip=True) if a.parent else title
-        td = parse_age_to_timedelta(parent_text)
+        td, age = parse_age_to_timedelta(parent_text)
         if td is None:
             # Some non-feed links may sneak through; skip if we don't see an age tag.
             continue
@@ -74,6 +114,6 @@ def get_today_titles_brutalist(limit=10, today_tz="Europe/Paris"):
         if key in seen:
             continue
         seen.add(key)
-        results.append({"title": title, "url": href, "age": AGE_RE.search(parent_text).group(0)})
+        results.append({"title": title, "url": href, "age": age})
 
     return results
@@ -1,25 +1,36 @@
 from __future__ import annotations
 import re
+import heapq
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
 from typing import Dict, List, Iterable
 import numpy as np
 import pandas as pd
 import html
 import unicodedata
-from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 
 
 # NORMALIZATION HELPERS
 _SOURCE_TRAILER_RE = re.compile(r"\s*[–—-]\s+[A-Z][\w .&’'-]{2,}$")  # strip ' — Reuters' or ' - Bloomberg'
+_WS_RE = re.compile(r"\s+")
 
 def fix_unicode(s: str) -> str:
     """Unescape HTML, normalize to Unicode NFC, trim/collapse spaces."""
-    s = html.unescape(s or "")
-    s = unicodedata.normalize("NFC", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    if not s:
+        return ""
+    # most headlines are plain ASCII without entities: skip both full-string passes for them
+    if "&" in s:
+        s = html.unescape(s)
+    if not s.isascii():
+        s = unicodedata.normalize("NFC", s)
+    return _WS_RE.sub(" ", s).strip()
 
 def strip_trailing_source(s: str) -> str:
     """Remove trailing '— Publisher' or ' - Publisher' if present."""
+    if "-" not in s and "–" not in s and "—" not in s:
+        return s.strip()
     return _SOURCE_TRAILER_RE.sub("", s).strip()
 
 def normalize_title(title: str) -> str:
@@ -29,34 +40,74 @@ def normalize_title(title: str) -> str:
     t = t.lower()
     return t
 
+def normalize_titles(titles: pd.Series) -> pd.Series:
+    """
+    Column version of normalize_title: same steps, but each one is a single pandas
+    string op over the whole Series instead of a Python call per headline.
+    """
+    t = titles.astype(str)
+    # html.unescape has no vectorized form, run it only on the rows that can contain entities
+    has_entity = t.str.contains("&", regex=False)
+    if has_entity.any():
+        t = t.copy()
+        t.loc[has_entity] = t.loc[has_entity].map(html.unescape)
+    t = t.str.normalize("NFC")
+    t = t.str.replace(_WS_RE, " ", regex=True).str.strip()
+    t = t.str.replace(_SOURCE_TRAILER_RE, "", regex=True).str.strip()
+    return t.str.lower()
+
 # VECTORIZATION
+_TOK = re.compile(r"(?u)\b\w\w+\b")  # CountVectorizer's default token_pattern: 2+ word chars
+_tokenize = _TOK.findall               # bound once, not looked up per title
+_STOP = ENGLISH_STOP_WORDS             # what stop_words="english" resolves to (already a frozenset)
+
 def build_count_matrix(titles: List[str],
                        min_df: int | float = 2,
                        max_df: int | float = 0.7,
                        max_features: int | None = 20000):
     """
+    Count unigrams + bigrams the way CountVectorizer(stop_words="english", ngram_range=(1, 2)) would,
+    but only keep the corpus totals: summarize_terms never looks at per-document counts, so no
+    docs x terms matrix is built; document frequencies are only used for the min_df/max_df pruning.
+
     Returns:
-      vectorizer, sparse count matrix X (docs x terms), vocabulary index (terms in order)
+      unigram Counter (term -> count), bigram Counter ("w1 w2" -> count)
     """
-    # CountVectorizer: bag-of-words COUNTS (not TF-IDF), good for frequency tables.
-    # - english stop-words: quick, decent baseline for headlines
-    # - ngram_range=(1,2): unigrams + bigrams
-    # - min_df / max_df: drop singletons and boilerplate-common tokens
-    vect = CountVectorizer(
-        lowercase=False,          # we already lowercased in normalize_title
-        stop_words="english",     # built-in English list  (you can pass a custom list)
-        ngram_range=(1, 2),       # unigrams + bigrams
-        min_df=min_df,
-        max_df=max_df,
-        max_features=max_features
-        # token_pattern default is (?u)\b\w\w+\b — 2+ word chars (kept)
-    )
-    X = vect.fit_transform(titles)
-    vocab = pd.Index(vect.get_feature_names_out(), name="term")
-    return vect, X, vocab
+    uni, bi, doc_freq = Counter(), Counter(), Counter()
+    for title in titles:
+        # titles are already lowercased by normalize_title; stop-words go before bigrams are formed
+        toks = [t for t in _tokenize(title) if t not in _STOP]
+        pairs = list(zip(toks, toks[1:]))
+        uni.update(toks)
+        bi.update(pairs)
+        doc_freq.update(set(toks))
+        doc_freq.update(set(pairs))
+    if not doc_freq:
+        raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+
+    # min_df / max_df: drop singletons and boilerplate-common tokens (ints are doc counts, floats proportions)
+    n_docs = len(titles)
+    max_doc_count = max_df if isinstance(max_df, int) else max_df * n_docs
+    min_doc_count = min_df if isinstance(min_df, int) else min_df * n_docs
+    if max_doc_count < min_doc_count:
+        raise ValueError("max_df corresponds to < documents than min_df")
+    for counter in (uni, bi):
+        for term in [t for t in counter if not min_doc_count <= doc_freq[t] <= max_doc_count]:
+            del counter[term]
+
+    # max_features: keep the most frequent terms overall
+    if max_features is not None and len(uni) + len(bi) > max_features:
+        keep = {t for t, _ in heapq.nlargest(max_features, [*uni.items(), *bi.items()], key=itemgetter(1))}
+        uni = Counter({t: c for t, c in uni.items() if t in keep})
+        bi = Counter({t: c for t, c in bi.items() if t in keep})
+    if not uni and not bi:
+        raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+
+    bi = Counter({" ".join(pair): c for pair, c in bi.items()})
+    return uni, bi
 
 #AGGREGATION
-def summarize_terms(X, vocab: pd.Index, top_n: int = 30):
+def summarize_terms(uni: Counter, bi: Counter, top_n: int = 30):
     """
     Produce:
       - overall top unigrams
@@ -64,31 +115,40 @@ def summarize_terms(X, vocab: pd.Index, top_n: int = 30):
       - tidy table (term, ngram, count, share)
     """
 
-    # total counts per term across all docs
-    term_counts = pd.Series(np.asarray(X.sum(axis=0)).ravel(), index=vocab, name="count").sort_values(ascending=False)
-    total_tokens = int(term_counts.sum()) or 1
-    term_df = term_counts.to_frame()
-    term_df["share"] = term_df["count"] / total_tokens
+    # total counts per term across all docs, as one preallocated int64 array (no dict merge, no dtype inference)
+    counts = np.fromiter(chain(uni.values(), bi.values()), dtype=np.int64, count=len(uni) + len(bi))
+    total_tokens = int(counts.sum()) or 1
+
+    # top-N straight from the counters: O(V log N) instead of sorting the whole vocabulary
+    def top_terms(counter: Counter) -> pd.DataFrame:
+        top = pd.DataFrame(heapq.nlargest(top_n, counter.items(), key=itemgetter(1)), columns=["term", "count"])
+        # an empty counter (e.g. no bigram reaches min_df) would otherwise give object columns
+        top = top.astype({"term": object, "count": np.int64})
+        top["share"] = top["count"] / total_tokens
+        return top
 
-    # split by ngram size (space present => bigram+)
-    is_bigram_plus = term_df.index.str.contains(r"\s")
-    uni = term_df.loc[~is_bigram_plus].head(top_n).reset_index()
-    bi  = term_df.loc[is_bigram_plus].head(top_n).reset_index()
+    uni_df = top_terms(uni)
+    bi_df = top_terms(bi)
 
     # annotate ngram type for the tidy table
-    tidy = term_df.reset_index()
-    tidy["ngram"] = tidy["term"].str.contains(r"\s").map(lambda b: "bigram+" if b else "unigram")
+    terms = pd.Index([*uni, *bi], name="term")
+    tidy = pd.Series(counts, index=terms, name="count").sort_values(ascending=False).to_frame()
+    tidy["share"] = tidy["count"] / total_tokens
+    tidy = tidy.reset_index()
+    # bigrams are joined with a single space, a literal substring test is enough (no regex engine)
+    is_bigram = tidy["term"].str.contains(" ", regex=False).to_numpy(dtype=bool)
+    tidy["ngram"] = np.where(is_bigram, "bigram+", "unigram")
 
     return {
-        "top_unigrams": uni,         # columns: term, count, share
-        "top_bigrams": bi,           # columns: term, count, share
+        "top_unigrams": uni_df,      # columns: term, count, share
+        "top_bigrams": bi_df,        # columns: term, count, share
         "tidy_all_terms": tidy       # columns: term, count, share, ngram
     }
 
 def keyword_frequency(records: Iterable[Dict], top_n: int = 30):
     """
     End-to-end:
-      records -> normalized titles -> count matrix -> top terms
+      records -> normalized titles -> term counts -> top terms
 
     Returns dict with:
       - 'top_unigrams'     (DataFrame: term, count, share)
@@ -96,18 +156,18 @@ def keyword_frequency(records: Iterable[Dict], top_n: int = 30):
       - 'tidy_all_terms'   (DataFrame: term, count, share, ngram)
       - 'df'               (the normalized dataframe of items)
     """
-    # Load into DataFrame and keep only non-empty titles
-    df = pd.DataFrame(records, columns=["date", "title", "url"]).copy()
-    df = df[df["title"].astype(str).str.strip().ne("")].reset_index(drop=True)
+    # Keep only non-empty titles (one pass over the records, no cast-copy of the column), then load into DataFrame
+    records = [r for r in records if str(r.get("title") or "").strip()]
+    df = pd.DataFrame.from_records(records, columns=["date", "title", "url"])
 
     # Normalize titles
-    df["title_norm"] = df["title"].astype(str).map(normalize_title)
+    df["title_norm"] = normalize_titles(df["title"])
 
-    # Vectorize (counts)
-    vect, X, vocab = build_count_matrix(df["title_norm"].tolist())
+    # Count terms
+    uni, bi = build_count_matrix(df["title_norm"].tolist())
 
     # Summaries
-    out = summarize_terms(X, vocab, top_n=top_n)
+    out = summarize_terms(uni, bi, top_n=top_n)
     out["df"] = df
     return out
 
@@ -1,11 +1,12 @@
 from datetime import datetime
-import json
+import orjson
 import os
 from main_scraper import get_news_and_analyze
 from plotters import plot_top_grams, quick_snapshot_charts
 import streamlit as st
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 import base64
 import altair as alt
 import yfinance as yf
@@ -19,29 +20,67 @@ FILE_PATH = "daily_data.jsonl"
 API_URL = f"https://api.github.com/repos/{REPO}/contents/{FILE_PATH}"
 
 
+@st.cache_resource  # the script reruns on every interaction, keep one pooled session per process
+def github_session() -> requests.Session:
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+    session.headers.update({"Authorization": f"token {GITHUB_TOKEN}"})
+    return session
+
+_SESSION = github_session()
+
+
 @st.cache_data(ttl=3600*6)  # cache for 6 hours
 def load_data(ticker: str, start: str, end: str) -> pd.DataFrame:
     data = yf.download(ticker, start=start, end=end)
     return data
 
 
-def load_today_or_false(date):
-    stored_data = None
-    # get actual file from repository
-    res = requests.get(API_URL, headers={"Authorization": f"token {GITHUB_TOKEN}"})
+def _fetch_raw():
+    """Get the JSONL file from the repository, returns (sha, raw bytes)."""
+    # GitHub answers 304 if the file did not change since our last fetch
+    etag = st.session_state.get("jsonl_etag", "")
+    res = _SESSION.get(API_URL, headers={"If-None-Match": etag} if etag else {})
+    if res.status_code == 304:
+        return st.session_state["jsonl_sha"], st.session_state["jsonl_content"]
     data = res.json()
-    content = base64.b64decode(data['content']).decode('utf-8')
-    for line in content.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            obj = json.loads(line)
-        except json.JSONDecodeError:
-            continue  # skip malformed lines
-        if obj.get("date") == date:
-            stored_data = obj
-            break
+    content = base64.b64decode(data['content'])
+    st.session_state["jsonl_etag"] = res.headers.get("ETag", "")
+    st.session_state["jsonl_sha"] = data["sha"]
+    st.session_state["jsonl_content"] = content
+    return data["sha"], content
+
+
+@st.cache_data(show_spinner=False)
+def _parse_jsonl(sha: str, _content: bytes) -> tuple[list[dict], dict]:
+    """Parse the JSONL records and index them by date once per file version (the leading underscore keeps the bytes out of the cache key)."""
+    lines = [line for line in _content.splitlines() if line.strip()]
+    try:
+        # well-formed file: one orjson call over the whole thing as a JSON array
+        records = orjson.loads(b"[" + b",".join(lines) + b"]")
+    except orjson.JSONDecodeError:
+        records = []
+        for line in lines:
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue  # skip malformed lines
+    # first record wins when a date appears twice, like the old linear scan
+    by_date = {obj.get("date"): obj for obj in reversed(records)}
+    return records, by_date
+
+
+@st.cache_data(show_spinner=False)
+def _daily_figures(date: str, payload: dict):
+    """Matplotlib figures of the daily tab; only rebuilt when the day's record changes, not on every widget rerun."""
+    fig_uni = plot_top_grams(pd.DataFrame(payload['top_unigrams']), name="unigrams")
+    fig_bi = plot_top_grams(pd.DataFrame(payload['top_bigrams']), name="bigrams")
+    fig_m1, fig_m2 = quick_snapshot_charts(payload)
+    return fig_uni, fig_bi, fig_m1, fig_m2
+
+
+def load_today_or_false(by_date, date):
+    stored_data = by_date.get(date)
     # if os.path.exists(path):
     #     with open(path, "r", encoding="utf-8") as f:
     #         for line in f:
@@ -57,7 +96,7 @@ def load_today_or_false(date):
     #                 break
     # else:
     #     return False
-    return stored_data, content, data
+    return stored_data
 
 
 DEFAULT_PATH = "daily_data.jsonl"
@@ -71,6 +110,11 @@ force_rescrape = st.sidebar.checkbox("Force re-scrape today", value=False)
 show_raw_record = st.sidebar.checkbox("Show raw JSON record", value=False)
 today = datetime.today().strftime('%Y-%m-%d')
 
+# -------- LOAD JSONL ---------
+# one fetch (and one cached parse) per rerun, shared by both tabs
+sha, content = _fetch_raw()
+parsed, by_date = _parse_jsonl(sha, content)
+
 # -------- TABS ---------
 daily_tab, history_tab = st.tabs(["Daily Dashboard", "History"])
 
@@ -90,7 +134,7 @@ with daily_tab:
 
     if not force_rescrape:
         status_placeholder.info("Checking for today's record…")
-        stored_data, content, data = load_today_or_false(date=today)  # returns the current data or None, and the full file content
+        stored_data = load_today_or_false(by_date, date=today)  # returns the current data or None
         if stored_data is not None:
             used_cached = True
             status_placeholder.success("Loaded today's record from JSONL.")
@@ -110,22 +154,26 @@ with daily_tab:
             #     mode = "w"
             # with open(path, mode, encoding="utf-8") as f:
             #     f.write(json.dumps(stored_data) + "\n")
-            updated_file = content + json.dumps(stored_data) + "\n"
-            res = requests.put(API_URL, json={
+            # the Contents API only takes whole files, so append the new line to the bytes we already hold
+            # and base64-encode once; orjson output is compact, which keeps both the file and the upload smaller
+            updated_file = bytearray(content)
+            updated_file += orjson.dumps(stored_data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+            res = _SESSION.put(API_URL, json={
                 "message": "Update JSONL via Streamlit",
-                "content": base64.b64encode(updated_file.encode()).decode(),
-                "sha": data["sha"]
-            }, headers={"Authorization": f"token {GITHUB_TOKEN}"})
+                "content": base64.b64encode(updated_file).decode(),
+                "sha": sha
+            })
+            parsed = parsed + [stored_data]  # so the History tab shows today without fetching the file again
             status_placeholder.success("Scraping and analysis complete. Data saved to JSONL.")
         else:
             # remove any existing record for today and append the new one
             outpath = path + "-tmp"
-            with open(path, "r") as infile, open(outpath, "w") as outfile:
+            with open(path, "rb") as infile, open(outpath, "wb") as outfile:
                 for line in infile:
-                    record = json.loads(line)
+                    record = orjson.loads(line)
                     if record["date"] == today:
                         record = stored_data  # overwrite this one
-                    outfile.write(json.dumps(record) + "\n")
+                    outfile.write(orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE))
             if os.path.exists(path):
                 os.remove(path)
             os.rename(outpath, path)
@@ -134,14 +182,14 @@ with daily_tab:
 
 
     # here we have data in a json format no matter what happened, so we can plot and print everything
+    fig_uni, fig_bi, fig_m1, fig_m2 = _daily_figures(stored_data['date'], stored_data)
+
     # Unigrams and bigrams
     st.subheader("Unigrams and Bigrams")
     col1, col2 = st.columns(2)
     with col1:
-        fig_uni = plot_top_grams(pd.DataFrame(stored_data['top_unigrams']), name="unigrams")
         st.pyplot(fig_uni)
     with col2:
-        fig_bi = plot_top_grams(pd.DataFrame(stored_data['top_bigrams']), name="bigrams")
         st.pyplot(fig_bi)
 
 
@@ -156,7 +204,6 @@ with daily_tab:
 
     # ---------- Vader and LM ----------
     st.subheader("LM and Vader Snapshot Charts")
-    fig_m1, fig_m2 = quick_snapshot_charts(stored_data)
     col3, col4 = st.columns(2)
     with col3:
         st.pyplot(fig_m1)
@@ -193,36 +240,15 @@ with history_tab:
     st.title("Historical Data")
     st.subheader("Analysis of past records stored in the JSONL file.")
 
-    # load all data from JSONL
-    _, content, _ = load_today_or_false(date="")  # we just want the full content
-    
-    hist_pct_neg = []
-    hist_pct_unc = []
-    hist_pct_pos = []
-    hist_bigrams = []
-    dates = []
-    for line in content.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            obj = json.loads(line)
-        except json.JSONDecodeError:
-            continue  # skip malformed lines
-        dates.append(obj['date'])
-        hist_pct_neg.append(obj['head_w_neg'])
-        hist_pct_unc.append(obj['head_w_unc'])
-        hist_pct_pos.append(obj['head_w_pos'])
-        hist_bigrams.append(obj['top_bigrams'][0]['term'])
-    hist_df = pd.DataFrame({
-        "date": dates,
-        "% LM-negative": hist_pct_neg,
-        "% LM-uncertain": hist_pct_unc,
-        "% LM-positive": hist_pct_pos
+    # one constructor call over the parsed records, pandas picks the columns it needs
+    hist_df = pd.DataFrame(parsed, columns=["date", "head_w_neg", "head_w_unc", "head_w_pos"]).rename(columns={
+        "head_w_neg": "% LM-negative",
+        "head_w_unc": "% LM-uncertain",
+        "head_w_pos": "% LM-positive"
     })
     bigrams_df = pd.DataFrame({
-        "date": dates,
-        "Top Bigrams": hist_bigrams
+        "date": hist_df["date"],
+        "Top Bigrams": [obj['top_bigrams'][0]['term'] for obj in parsed]
     })
     pd_dates = pd.to_datetime(hist_df['date'])
     prices = sp500["Close"].reindex(pd_dates, method="ffill")
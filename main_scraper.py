@@ -1,9 +1,10 @@
 from timeF_scraper import get_today_titles_timeF
 from brutalist_scraper import get_today_titles_brutalist, parse_age_to_timedelta
-from skimfeed_scraper import get_today_titles_skimfeed
+from skimfeed_scraper import get_today_titles_skimfeed, filter_today
 from keyword_frequency import keyword_frequency
-from sentiment_tone import add_lm_and_vader, overall_tone_summary, top_lm_terms, load_lm_lexicon_csv
+from sentiment_tone import add_lm_and_vader, overall_tone_summary, top_lm_terms, load_lm_lexicon_csv, headline_features, feature_means
 
+from concurrent.futures import ThreadPoolExecutor, Future
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import sys
@@ -11,52 +12,67 @@ import pandas as pd
 
 
 
+def scraper_result(future: Future, source: str):
+    """Result of a scraper future; a failing source counts as "no headlines" instead of aborting the run."""
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"{source} scraper failed: {e!r}", file=sys.stderr)
+        return None
+
 def get_news_and_analyze():
 
     full_news = []
     today = datetime.today().strftime('%Y-%m-%d')
+    tz = "Europe/Paris"  # change if you want the definition of "today" in another tz
+
+    # The three sources are independent network fetches: run them side by side,
+    # so the wall time is the slowest one instead of the sum of all three.
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        f_timef = ex.submit(get_today_titles_timeF)
+        f_brutalist = ex.submit(get_today_titles_brutalist, limit=10, today_tz=tz)
+        # all of skimfeed in one fetch; "today" is filtered below, so the fallback needs no second request
+        f_skimfeed = ex.submit(get_today_titles_skimfeed, only_today_if_possible=False)
 
     # Get today's business headlines from timeF.com
-    items = get_today_titles_timeF()
+    items = scraper_result(f_timef, "TimeF")
     if not items:
         print("No business headlines found for today from TimeF.")
     else:
-        for it in items:
-            full_news.append(it)
+        full_news.extend(items)
 
     # Get today's business headlines from brutalist.report
-    tz = "Europe/Paris"  # change if you want the definition of "today" in another tz
-    items = get_today_titles_brutalist(limit=10, today_tz=tz)
+    items = scraper_result(f_brutalist, "brutalist")
     if not items:
         print("No business headlines found for today from brutalist.")
     else:
-        for it in items:
-            if "age" in it:
-                now = datetime.now(ZoneInfo(tz))
-                td = parse_age_to_timedelta(it["age"])
-                if td:
-                    it["date"] = (now - td).isoformat()
-            full_news.append(it)
+        # published-at = now - age, for the items that carry a parsable age tag
+        now = datetime.now(ZoneInfo(tz))
+        full_news.extend(
+            {**it, "date": (now - td).isoformat()} if (td := parse_age_to_timedelta(it.get("age", ""))[0]) else it
+            for it in items
+        )
 
     # Get today's business headlines from skimfeed.com
-    data = get_today_titles_skimfeed(only_today_if_possible=True)
+    all_data = scraper_result(f_skimfeed, "skimfeed")
+    data = filter_today(all_data) if all_data else all_data
 
     if not data:
         print("No items found with date info. Returning ALL items instead.", file=sys.stderr)
-        data = get_today_titles_skimfeed(only_today_if_possible=False)
+        data = all_data
 
     if not data:
         print("No items found")
     else:
-        for k in data.keys():
-            for it in data[k]:
-                standardized_it = {
-                    "title": it.title,
-                    "url": it.url,
-                    "date": it.published,
-                    "source": it.section if it.section != 'Latest' else '',
-                }
-                full_news.append(standardized_it)
+        full_news.extend(
+            {
+                "title": it.title,
+                "url": it.url,
+                "date": it.published,
+                "source": it.section if it.section != 'Latest' else '',
+            }
+            for section_items in data.values() for it in section_items
+        )
 
     store_data = {}
     store_data['date'] = today
@@ -66,64 +82,54 @@ def get_news_and_analyze():
 
     # get top N unigrams and bigrams
     n = 10
+    # nlargest does a partial selection, no need to sort the whole table to take the first n;
+    # summarize_terms keeps "count" int64 even for an empty top table, which nlargest needs
     df = keyword_freq_results['top_unigrams']
-    top_unigrams = (df.sort_values("count", ascending=False)
-                 .head(n)
-                 .loc[:, ["term", "count"]])
+    top_unigrams = df.nlargest(n, "count").loc[:, ["term", "count"]]
     store_data['top_unigrams'] = top_unigrams.to_dict(orient="records")
     df = keyword_freq_results['top_bigrams']
-    top_bigrams = (df.sort_values("count", ascending=False)
-                 .head(n)
-                 .loc[:, ["term", "count"]])
+    top_bigrams = df.nlargest(n, "count").loc[:, ["term", "count"]]
     store_data['top_bigrams'] = top_bigrams.to_dict(orient="records")
 
     # Sentiment/Tone analysis
     titles_only_df = pd.DataFrame(full_news, columns=["title"])
 
-    scored = add_lm_and_vader(titles_only_df, "Loughran-McDonald_MasterDictionary_1993-2024.csv")
-    most_negative = scored.loc[scored["lm_neg"].idxmax()]
-    store_data['most_negative'] = most_negative['title']
-    store_data['most_negative_lm_score'] = most_negative['lm_neg']
-    store_data['most_negative_vader_score'] = most_negative['vader_compound']
-    most_positive = scored.loc[scored["lm_pos"].idxmax()]
-    store_data['most_positive'] = most_positive['title']
-    store_data['most_positive_lm_score'] = most_positive['lm_pos']
-    store_data['most_positive_vader_score'] = most_positive['vader_compound']
-    most_uncertain = scored.loc[scored["lm_uncert"].idxmax()]
-    store_data['most_uncertain'] = most_uncertain['title']
-    store_data['most_uncertain_lm_score'] = most_uncertain['lm_uncert']
-    store_data['most_uncertain_vader_score'] = most_uncertain['vader_compound']
-    most_litigious = scored.loc[scored["lm_litig"].idxmax()]
-    store_data['most_litigious'] = most_litigious['title']
-    store_data['most_litigious_lm_score'] = most_litigious['lm_litig']
-    store_data['most_litigious_vader_score'] = most_litigious['vader_compound']
-    most_constraining = scored.loc[scored["lm_constr"].idxmax()]
-    store_data['most_constraining'] = most_constraining['title']
-    store_data['most_constraining_lm_score'] = most_constraining['lm_constr']
-    store_data['most_constraining_vader_score'] = most_constraining['vader_compound']
-
-    # Distributions
-    vader_mean = float(scored["vader_compound"].mean())
+    # full-precision columns: the means below are persisted, so they must not pick up float32 rounding
+    scored = add_lm_and_vader(titles_only_df, "Loughran-McDonald_MasterDictionary_1993-2024.csv", downcast=False)
+    # most extreme headline per LM category: one idxmax over the five columns, then a single row lookup
+    extremes = {
+        "most_negative": "lm_neg",
+        "most_positive": "lm_pos",
+        "most_uncertain": "lm_uncert",
+        "most_litigious": "lm_litig",
+        "most_constraining": "lm_constr",
+    }
+    lm_cols = list(extremes.values())
+    top_idx = scored[lm_cols].idxmax()
+    top_rows = scored.loc[top_idx.values, ["title", "vader_compound"] + lm_cols]
+    for (key, col), (_, row) in zip(extremes.items(), top_rows.iterrows()):
+        store_data[key] = row['title']
+        store_data[f'{key}_lm_score'] = float(row[col])
+        store_data[f'{key}_vader_score'] = float(row['vader_compound'])
+
+    # Distributions (all column means in one pass over the feature matrix)
+    means = feature_means(headline_features(scored))
+    vader_mean = float(means["vader_compound"])
     # number of headlines with neg/unc/pos tokens
-    pct_neg    = float(scored["lm_has_neg"].mean()) * 100.0
-    pct_unc    = float(scored["lm_has_uncert"].mean()) * 100.0
-    pct_pos    = float(scored["lm_has_pos"].mean()) * 100.0
+    pct_neg    = float(means["lm_has_neg"]) * 100.0
+    pct_unc    = float(means["lm_has_uncert"]) * 100.0
+    pct_pos    = float(means["lm_has_pos"]) * 100.0
     store_data['vader_mean'] = vader_mean
     store_data['head_w_neg'] = pct_neg
     store_data['head_w_unc'] = pct_unc
     store_data['head_w_pos'] = pct_pos
 
     # shares of neg/pos/unc/litig/constr tokens
-    negative_pct = float(scored["lm_neg_share"].mean())
-    positive_pct = float(scored["lm_pos_share"].mean())
-    uncertainty_pct = float(scored["lm_uncert_share"].mean())
-    litigious_pct = float(scored["lm_litig_share"].mean())
-    constraining_pct = float(scored["lm_constr_share"].mean())
-    store_data['neg_share_of_tok'] = negative_pct
-    store_data['pos_share_of_tok'] = positive_pct
-    store_data['unc_share_of_tok'] = uncertainty_pct
-    store_data['litig_share_of_tok'] = litigious_pct
-    store_data['constr_share_of_tok'] = constraining_pct
+    store_data['neg_share_of_tok'] = float(means["lm_neg_share"])
+    store_data['pos_share_of_tok'] = float(means["lm_pos_share"])
+    store_data['unc_share_of_tok'] = float(means["lm_uncert_share"])
+    store_data['litig_share_of_tok'] = float(means["lm_litig_share"])
+    store_data['constr_share_of_tok'] = float(means["lm_constr_share"])
 
     # Overall tone
     #tone_df = overall_tone_summary(scored)
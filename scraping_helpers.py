@@ -0,0 +1,7 @@
+from __future__ import annotations
+from lxml.html import HtmlElement
+
+
+def stripped_text(el: HtmlElement, sep: str = "") -> str:
+    """Text of an lxml element, each text node stripped and joined with sep (like bs4's get_text(sep, strip=True))."""
+    return sep.join(t for t in (s.strip() for s in el.itertext()) if t)
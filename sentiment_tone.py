@@ -1,11 +1,17 @@
 from __future__ import annotations
 from pathlib import Path
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from collections import Counter
+from functools import lru_cache
+from itertools import chain, repeat
+from operator import itemgetter
+import os
 import re
-from dataclasses import dataclass
-from typing import Dict, Set
+import string
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional
+import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 
 # TOKENIZATION
 _WORD_RE = re.compile(r"[A-Za-z0-9]{2,}")
@@ -19,14 +25,60 @@ def tokenize_upper(s: str) -> list[str]:
         s = "" if s is None else str(s)
     return [m.group(0).upper() for m in _WORD_RE.finditer(s)]
 
+def _ensure_titles(df_or_titles: pd.DataFrame | np.ndarray) -> np.ndarray:
+    """
+    Titles as a numpy object array of str (missing -> ""). Takes a DataFrame with a "title"
+    column, or an array already cleaned by this function (returned as is).
+    """
+    if isinstance(df_or_titles, np.ndarray):
+        return df_or_titles
+    return df_or_titles["title"].fillna("").astype(str).to_numpy(dtype=object)
+
+def _unique_tokens(titles: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    tokenize_upper for a whole column at once. Feeds re-post the same headline, so only the distinct
+    titles are tokenized: returns each row's code into those titles, the flat (object) array of their
+    tokens, and the number of tokens of each distinct title.
+    """
+    codes, uniq = pd.factorize(titles)
+    toks = [_WORD_RE.findall(t) for t in uniq]
+    uniq_len = np.fromiter(map(len, toks), dtype=np.int64, count=len(toks))
+    # tokens are plain ASCII letters/digits, so one upper() over the joined string is exact
+    joined = " ".join(chain.from_iterable(toks)).upper()
+    uniq_flat = np.array(joined.split(" ") if joined else [], dtype=object)
+    return codes, uniq_flat, uniq_len
+
 # LM LEXICON AND METRIC
+_LM_CATEGORIES = ("negative", "uncertainty", "litigious", "constraining", "positive")
+
 @dataclass(frozen=True)
 class LMLex:
-    negative: Set[str]
-    uncertainty: Set[str]
-    litigious: Set[str]
-    constraining: Set[str]
-    positive: Set[str]
+    negative: FrozenSet[str]
+    uncertainty: FrozenSet[str]
+    litigious: FrozenSet[str]
+    constraining: FrozenSet[str]
+    positive: FrozenSet[str]
+    # word -> category bitmask (bit k set if the word is in _LM_CATEGORIES[k]): one lookup covers all five sets.
+    # load_lm_lexicon_csv fills it while reading the CSV; otherwise it is derived from the sets.
+    bits: Optional[Dict[str, int]] = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self):
+        if self.bits is None:
+            out: Dict[str, int] = {}
+            for k, cat in enumerate(_LM_CATEGORIES):
+                for word in getattr(self, cat):
+                    out[word] = out.get(word, 0) | (1 << k)
+            object.__setattr__(self, "bits", out)
+
+def _encode_tokens(flat: np.ndarray, lm: LMLex) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flat tokens as integer codes into their vocabulary (in order of first appearance), plus LMLex.bits
+    for each vocabulary word (0 for non-LM words, uint8). Every distinct token is looked up once;
+    everything after that is integer indexing.
+    """
+    codes, vocab = pd.factorize(flat)
+    vocab_bits = np.fromiter(map(lm.bits.get, vocab, repeat(0)), dtype=np.uint8, count=len(vocab))
+    return codes, vocab, vocab_bits
 
 def load_lm_lexicon_csv(path: str | Path) -> LMLex:
     """
@@ -39,7 +91,15 @@ def load_lm_lexicon_csv(path: str | Path) -> LMLex:
       - uncertainty
       - litigious
       - constraining
+
+    Loaded once per file version: the result is cached on (path, modification time), so scoring
+    several frames (or top_lm_terms after add_lm_and_vader) doesn't re-read the CSV.
     """
+    path = os.path.abspath(path)
+    return _load_lm_lexicon_cached(path, os.path.getmtime(path))
+
+@lru_cache(maxsize=4)
+def _load_lm_lexicon_cached(path: str, mtime: float) -> LMLex:
     df = pd.read_csv(path)
     cols = {c.lower(): c for c in df.columns}  # case-insensitive map
 
@@ -55,85 +115,176 @@ def load_lm_lexicon_csv(path: str | Path) -> LMLex:
     c_con   = need("constraining")
     c_pos   = need("positive")
 
-    def pick(colname: str) -> Set[str]:
-        # LM marks membership with 1 (sometimes >0). Keep uppercase to match tokenize_upper().
-        return set(df.loc[df[colname] > 0, c_word].astype(str).str.upper())
+    # LM marks membership with 1 (sometimes >0). Keep uppercase to match tokenize_upper().
+    # One mask per category (same order as _LM_CATEGORIES); only the few thousand words that are in
+    # some category get uppercased, not the whole ~86k-word dictionary.
+    masks = [df[c].to_numpy() > 0 for c in (c_neg, c_unc, c_lit, c_con, c_pos)]
+    any_cat = np.logical_or.reduce(masks)
+    words = pd.Series(df[c_word].to_numpy()[any_cat]).astype(str).str.upper().to_numpy()
+    masks = [m[any_cat] for m in masks]
+
+    code = np.zeros(len(words), dtype=np.int64)
+    for k, mask in enumerate(masks):
+        code |= mask.astype(np.int64) << k
+    bits: Dict[str, int] = {}
+    for word, c in zip(words.tolist(), code.tolist()):
+        bits[word] = bits.get(word, 0) | c
 
+    negative, uncertainty, litigious, constraining, positive = (frozenset(words[m].tolist()) for m in masks)
     return LMLex(
-        negative=pick(c_neg),
-        uncertainty=pick(c_unc),
-        litigious=pick(c_lit),
-        constraining=pick(c_con),
-        positive=pick(c_pos),
+        negative=negative,
+        uncertainty=uncertainty,
+        litigious=litigious,
+        constraining=constraining,
+        positive=positive,
+        bits=bits,
     )
 
-def add_lm_metrics(df: pd.DataFrame, lm: LMLex) -> pd.DataFrame:
+def add_lm_metrics(df: pd.DataFrame, lm: LMLex, titles: np.ndarray | None = None, downcast: bool = True) -> pd.DataFrame:
     """
     Add LM counts, shares, and binary flags per title.
     - counts: how many tokens from the title are in each LM category
     - shares: counts / total tokens in title (avoid divide-by-zero via max(1, n_tokens))
     - flags : 1 if any token from that category appears in the title
+    titles: optional _ensure_titles(df), to skip converting the column again.
+    downcast: smallest int type that fits for counts (int8 for headlines), float32 shares, bool flags;
+              False gives the legacy layout: all 15 columns float64 (counts and flags as 0.0/1.0 values).
     """
-    def score_title(title: str) -> Dict[str, int | float]:
-        toks = tokenize_upper(title)
-        n = max(1, len(toks))
-        c_neg  = sum(tok in lm.negative     for tok in toks)
-        c_unc  = sum(tok in lm.uncertainty  for tok in toks)
-        c_lit  = sum(tok in lm.litigious    for tok in toks)
-        c_con  = sum(tok in lm.constraining for tok in toks)
-        c_pos  = sum(tok in lm.positive    for tok in toks)
-        return {
-            "lm_tokens": n,
-            "lm_neg": c_neg,
-            "lm_uncert": c_unc,
-            "lm_litig": c_lit,
-            "lm_constr": c_con,
-            "lm_pos": c_pos,
-            "lm_neg_share": c_neg / n,
-            "lm_uncert_share": c_unc / n,
-            "lm_litig_share": c_lit / n,
-            "lm_constr_share": c_con / n,
-            "lm_pos_share": c_pos / n,
-            "lm_has_neg": int(c_neg > 0),
-            "lm_has_uncert": int(c_unc > 0),
-            "lm_has_litig": int(c_lit > 0),
-            "lm_has_constr": int(c_con > 0),
-            "lm_has_pos": int(c_pos > 0),
-        }
-
-    lm_df = df["title"].map(score_title).apply(pd.Series)
-    return pd.concat([df, lm_df], axis=1)
+    # the distinct titles are tokenized in one pass and every distinct token is looked up once in the
+    # category bitmask table; the LM hits are scattered into a (titles, 5) count matrix with a single
+    # bincount, then spread back to the rows
+    codes, flat, uniq_len = _unique_tokens(_ensure_titles(df if titles is None else titles))
+    tok_codes, _, vocab_bits = _encode_tokens(flat, lm)
+    bits = vocab_bits[tok_codes]
+    n_uniq = len(uniq_len)
+    tok_title = np.repeat(np.arange(n_uniq), uniq_len)
+
+    hit = np.flatnonzero(bits)
+    n_cat = len(_LM_CATEGORIES)
+    tok_i, cat_i = np.nonzero((bits[hit, None] >> np.arange(n_cat)) & 1)
+    mat = np.bincount(tok_title[hit[tok_i]] * n_cat + cat_i, minlength=n_uniq * n_cat).reshape(n_uniq, n_cat)
+    mat = mat[codes]
+    n = np.maximum(1, uniq_len)[codes]
+
+    counts = dict(zip(("neg", "uncert", "litig", "constr", "pos"), mat.T))
+    shares = {name: c / n for name, c in counts.items()}
+    flags = {name: c > 0 for name, c in counts.items()}
+    if downcast:
+        n = pd.to_numeric(n, downcast="integer")
+        counts = {name: pd.to_numeric(c, downcast="integer") for name, c in counts.items()}
+        shares = {name: sh.astype(np.float32) for name, sh in shares.items()}
+    else:
+        n = n.astype(np.float64)
+        counts = {name: c.astype(np.float64) for name, c in counts.items()}
+        flags = {name: f.astype(np.float64) for name, f in flags.items()}
+
+    cols = {"lm_tokens": n}
+    cols.update({f"lm_{name}": c for name, c in counts.items()})
+    cols.update({f"lm_{name}_share": sh for name, sh in shares.items()})
+    cols.update({f"lm_has_{name}": f for name, f in flags.items()})
+    # new columns on a shallow copy: the caller's frame gets no new columns, and its existing
+    # data isn't copied again the way concat does
+    df = df.copy(deep=False)
+    for name, values in cols.items():
+        df[name] = values
+    return df
 
 #VADER
-_vader = SentimentIntensityAnalyzer()  # vaderSentiment.readthedocs.io
+@lru_cache(maxsize=1)
+def _get_vader() -> tuple[SentimentIntensityAnalyzer, pd.Index]:
+    """
+    The analyzer (vaderSentiment.readthedocs.io) and its lexicon words, built on first use.
+    Per process, so parallel workers build their own instead of receiving a pickled one.
+    """
+    vader = SentimentIntensityAnalyzer()
+    return vader, pd.Index(list(vader.lexicon))
+
+_VADER_COLS = ("vader_neg", "vader_neu", "vader_pos", "vader_compound")
+_VADER_KEYS = itemgetter("neg", "neu", "pos", "compound")
+
+def _vader_word_stats(titles: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Per title: number of words and number of VADER lexicon hits, tokenized like vaderSentiment's
+    SentiText (whitespace split, punctuation stripped unless that leaves <= 2 chars, lowercased).
+    """
+    words = titles.str.split()
+    lengths = words.str.len().to_numpy(dtype=np.int64)
+    flat = pd.Series(list(chain.from_iterable(words)), dtype=object)
+    stripped = flat.str.strip(string.punctuation)
+    flat = stripped.where(stripped.str.len() > 2, flat).str.lower()
+    row_id = np.repeat(np.arange(len(titles)), lengths)
+    hits = np.bincount(row_id[flat.isin(_get_vader()[1]).to_numpy()], minlength=len(titles))
+    return lengths, hits
 
-def add_vader(df: pd.DataFrame) -> pd.DataFrame:
+def add_vader(df: pd.DataFrame, titles: np.ndarray | None = None) -> pd.DataFrame:
     """
     Add VADER sentiment scores:
       - vader_neg, vader_neu, vader_pos
       - vader_compound (normalized polarity in [-1, 1])
+    titles: optional _ensure_titles(df), to skip converting the column again.
     """
-    s = df["title"].astype(str).map(_vader.polarity_scores).apply(pd.Series)
-    s = s.rename(columns={"neg": "vader_neg", "neu": "vader_neu", "pos": "vader_pos", "compound": "vader_compound"})
-    return pd.concat([df, s], axis=1)
+    # Scored once per distinct title, then spread back to the rows.
+    # A headline with no lexicon word gets valence 0 on every token, whatever the boosters/negations
+    # around them, so VADER's output is fixed: all zeros, neu = 1 (or 0 with no tokens at all).
+    # Only ASCII titles qualify (emoji get rewritten to lexicon words); the rest go through polarity_scores.
+    codes, uniq = pd.factorize(_ensure_titles(df if titles is None else titles))
+    n_words, n_hits = _vader_word_stats(pd.Series(uniq, dtype=object))
+    slow = (n_hits > 0) | ~np.fromiter((t.isascii() for t in uniq), dtype=bool, count=len(uniq))
+
+    # one preallocated row of (neg, neu, pos, compound) per distinct title; the slow-path dicts are
+    # unpacked straight into it instead of being collected into a DataFrame first
+    scores = np.zeros((len(uniq), len(_VADER_COLS)))
+    scores[:, 1] = n_words > 0
+    if slow.any():
+        polarity_scores = _get_vader()[0].polarity_scores
+        for i in np.flatnonzero(slow):
+            scores[i] = _VADER_KEYS(polarity_scores(uniq[i]))
+    values = scores[codes]
+    df = df.copy(deep=False)
+    for j, name in enumerate(_VADER_COLS):
+        df[name] = values[:, j]
+    return df
 
 #GENERAL HELPERS
+TONE_FEATURES = (
+    "vader_compound", "lm_has_neg", "lm_has_uncert", "lm_has_pos",
+    "lm_neg_share", "lm_uncert_share", "lm_pos_share", "lm_litig_share", "lm_constr_share",
+)
+
+def headline_features(df_scored: pd.DataFrame, cols: tuple[str, ...] = TONE_FEATURES) -> np.ndarray:
+    """
+    Scored columns as one float64 (N, len(cols)) matrix, column-major so each feature is a contiguous
+    buffer: per-feature reductions (feat.mean(axis=0)) and ML inputs read it without any pandas overhead.
+    float64 so that float64 source columns (vader_compound) go through unchanged.
+    """
+    feat = np.empty((len(df_scored), len(cols)), dtype=np.float64, order="F")
+    for j, c in enumerate(cols):
+        feat[:, j] = df_scored[c].to_numpy()
+    return feat
+
+def feature_means(feat: np.ndarray, cols: tuple[str, ...] = TONE_FEATURES) -> Dict[str, float]:
+    """Column means of a headline_features matrix by name (NaN when there are no rows)."""
+    means = feat.mean(axis=0) if len(feat) else np.full(len(cols), np.nan)
+    return dict(zip(cols, means.tolist()))
+
 def overall_tone_summary(df_scored: pd.DataFrame) -> pd.DataFrame:
     """
     Return one-row summary with interpretable, comparable metrics.
     """
+    # one reduction over the feature matrix; the median is only wanted for the compound score
+    mean = feature_means(headline_features(df_scored))
     out = pd.DataFrame({
         "n_items": [len(df_scored)],
-        "vader_compound_mean": [df_scored["vader_compound"].mean()],
+        "vader_compound_mean": [mean["vader_compound"]],
         "vader_compound_median": [df_scored["vader_compound"].median()],
-        "lm_negative_headline_pct": [df_scored["lm_has_neg"].mean()],       
-        "lm_uncertain_headline_pct": [df_scored["lm_has_uncert"].mean()],
-        "lm_positive_headline_pct": [df_scored["lm_has_pos"].mean()],
-        "lm_neg_share_mean": [df_scored["lm_neg_share"].mean()],
-        "lm_uncert_share_mean": [df_scored["lm_uncert_share"].mean()],
-        "lm_pos_share_mean": [df_scored["lm_pos_share"].mean()],
-        "lm_litig_share_mean": [df_scored["lm_litig_share"].mean()],
-        "lm_constr_share_mean": [df_scored["lm_constr_share"].mean()],
+        "lm_negative_headline_pct": [mean["lm_has_neg"]],
+        "lm_uncertain_headline_pct": [mean["lm_has_uncert"]],
+        "lm_positive_headline_pct": [mean["lm_has_pos"]],
+        "lm_neg_share_mean": [mean["lm_neg_share"]],
+        "lm_uncert_share_mean": [mean["lm_uncert_share"]],
+        "lm_pos_share_mean": [mean["lm_pos_share"]],
+        "lm_litig_share_mean": [mean["lm_litig_share"]],
+        "lm_constr_share_mean": [mean["lm_constr_share"]],
     })
     return out
 
@@ -143,32 +294,21 @@ def top_lm_terms(df_scored: pd.DataFrame, lm: LMLex, top_n: int = 25) -> Dict[st
     Show which LM dictionary words most often triggered each category in your corpus.
     This is great for QA and interpretability (you can spot junky tokens or domain specifics).
     """
-    counters = {
-        "negative": Counter(),
-        "uncertainty": Counter(),
-        "litigious": Counter(),
-        "constraining": Counter(),
-        "positive": Counter(),
-    }
-
-    for title in df_scored["title"].astype(str):
-        toks = tokenize_upper(title)
-        for tok in toks:
-            if tok in lm.negative:     
-                counters["negative"][tok] += 1
-            if tok in lm.uncertainty:  
-                counters["uncertainty"][tok] += 1
-            if tok in lm.litigious:    
-                counters["litigious"][tok] += 1
-            if tok in lm.constraining: 
-                counters["constraining"][tok] += 1
-            if tok in lm.positive:    
-                counters["positive"][tok] += 1
-
-    # Convert to sorted Series for convenience
-    return {k: pd.Series(v).sort_values(ascending=False).head(top_n) for k, v in counters.items()}
-
-def add_lm_and_vader(df: pd.DataFrame, lm_csv_path: str | Path) -> pd.DataFrame:
+    # tokens of the distinct titles only, each weighted by how many rows repeat its title, counted with
+    # one bincount over the token codes; words stay in order of first appearance before sorting,
+    # as the per-category Counters had them
+    codes, flat, uniq_len = _unique_tokens(_ensure_titles(df_scored))
+    tok_codes, vocab, vocab_bits = _encode_tokens(flat, lm)
+    repeats = np.bincount(codes, minlength=len(uniq_len))
+    freq = np.bincount(tok_codes, weights=np.repeat(repeats, uniq_len), minlength=len(vocab)).astype(np.int64)
+    out = {}
+    for k, cat in enumerate(_LM_CATEGORIES):
+        words = np.flatnonzero(vocab_bits & (1 << k))
+        counts = pd.Series(freq[words], index=pd.Index(vocab[words], dtype=object))
+        out[cat] = counts.sort_values(ascending=False).head(top_n)
+    return out
+
+def add_lm_and_vader(df: pd.DataFrame, lm_csv_path: str | Path, downcast: bool = True) -> pd.DataFrame:
     """
     Convenience wrapper:
       - loads LM (from your CSV),
@@ -176,6 +316,27 @@ def add_lm_and_vader(df: pd.DataFrame, lm_csv_path: str | Path) -> pd.DataFrame:
       - returns a new DataFrame with all features.
     """
     lm = load_lm_lexicon_csv(lm_csv_path)
-    df1 = add_lm_metrics(df.copy(), lm)
-    df2 = add_vader(df1)
+    titles = _ensure_titles(df)
+    df1 = add_lm_metrics(df.copy(), lm, titles, downcast)
+    df2 = add_vader(df1, titles)
     return df2
+
+def _score_chunk(df: pd.DataFrame, lm: LMLex, downcast: bool = True) -> pd.DataFrame:
+    titles = _ensure_titles(df)
+    return add_vader(add_lm_metrics(df.copy(), lm, titles, downcast), titles)
+
+def add_lm_and_vader_parallel(
+    df: pd.DataFrame, lm_csv_path: str | Path, n_jobs: int = -1, chunk_size: int = 5000, downcast: bool = True
+) -> pd.DataFrame:
+    """
+    Same output as add_lm_and_vader, with the rows scored in chunks of chunk_size across worker processes.
+    Only pays off on big frames (e.g. re-scoring the whole history): anything that fits in one chunk
+    is scored in-process, since starting the workers costs more than the scoring.
+    """
+    lm = load_lm_lexicon_csv(lm_csv_path)
+    if len(df) <= chunk_size:
+        return _score_chunk(df, lm, downcast)
+    chunks = [df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size)]
+    parts = Parallel(n_jobs=n_jobs)(delayed(_score_chunk)(chunk, lm, downcast) for chunk in chunks)
+    # chunks can downcast to different int widths; concat widens them to a common type
+    return pd.concat(parts)
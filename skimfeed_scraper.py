@@ -1,25 +1,38 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 import re
-from datetime import datetime
+from datetime import date, datetime
 from zoneinfo import ZoneInfo
 import requests
-from bs4 import BeautifulSoup, Tag
+import lxml.html
+from lxml import etree
+from lxml.html import HtmlElement
 from urllib.parse import urlparse
 from dataclasses import dataclass
 from typing import Optional, Dict, List
 from dateutil import parser as dateparser
+from scraping_helpers import stripped_text
 
 USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124 Safari/537.36"
 
 URL = "https://skimfeed.com/custom.php?f=l%2Cp%2C119%2C121%2C122%2C123%2C124%2C125%2C126%2C127%2C156"
 TIMEZONE = "Europe/Paris"
+_TZ = ZoneInfo(TIMEZONE)
 
 # Try resolving full titles for "What's Hot" by fetching destination pages if truncated
 RESOLVE_WHATS_HOT_FULL_TITLES = True
 MAX_WHATS_HOT_RESOLVES = 10    # don't hammer sites
 
 ELLIPSIS_RE = re.compile(r"\u2026|\.\.\.$")  # … or ...
+_HEADINGS = ("h1", "h2", "h3", "h4")
+_DT_ATTR_KEYS = ("data-time", "data-ts", "data-timestamp", "data-pubdate", "datetime", "title")
+_ISO_DATE_RE = re.compile(r"\b\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2})?)?")
+_DIGIT_RE = re.compile(r"\d")
+_WS_RE = re.compile(r"\s+")
+
+# compiled once; each returns at most one node, the first in document order
+_NEXT_TIME = (etree.XPath("descendant::time[1]"), etree.XPath("following::time[1]"))
+_NEXT_TEXT = (etree.XPath("descendant::text()[1]"), etree.XPath("following::text()[1]"))
 
 @dataclass
 class Item:
@@ -29,10 +42,28 @@ class Item:
     published: Optional[str] = None  # ISO-8601 if found
 
 def fetch(url: str) -> requests.Response:
-    r = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=20)
-    r.raise_for_status()
+    # streamed: the body is read by the parser, see parse_response
+    r = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=20, stream=True)
+    try:
+        r.raise_for_status()
+    except requests.HTTPError:
+        r.close()  # nobody else gets the response to close it
+        raise
     return r
 
+def parse_response(resp: requests.Response) -> HtmlElement:
+    """
+    Feed a streamed response straight into lxml (no decoded str copy of the whole page), then close it.
+    The charset requests would use for .text is passed on (for text/* without a header charset that is
+    ISO-8859-1, same as .text); lxml only sniffs it from the page when requests has no encoding at all.
+    """
+    try:
+        resp.raw.decode_content = True  # gzip/deflate handled like .content does
+        parser = lxml.html.HTMLParser(encoding=resp.encoding) if resp.encoding else None
+        return lxml.html.parse(resp.raw, parser=parser).getroot()
+    finally:
+        resp.close()
+
 def is_external(href: str) -> bool:
     try:
         netloc = urlparse(href).netloc.lower()
@@ -40,86 +71,128 @@ def is_external(href: str) -> bool:
         return False
     return bool(netloc) and "skimfeed.com" not in netloc
 
+def _first_of(el: HtmlElement, paths):
+    """First hit of the first XPath in paths that matches anything (descendants before following nodes)."""
+    for path in paths:
+        hits = path(el)
+        if hits:
+            return hits[0]
+    return None
+
 def normalize_section_name(raw: str) -> str:
     # Section headers sometimes look like "Economist Business + www.economist.com"
-    txt = re.sub(r"\s+", " ", raw.strip())
+    txt = _WS_RE.sub(" ", raw.strip())
     if " +" in txt:
         txt = txt.split(" +", 1)[0]
     return txt
 
-def nearest_section_heading(a: Tag) -> str:
-    h = a.find_previous(["h1", "h2", "h3", "h4"])
-    if h:
-        return normalize_section_name(h.get_text(" ", strip=True))
-    return "Uncategorized"
-
-def prefer_full_title(section: str, a: Tag) -> str:
-    visible = a.get_text(" ", strip=True)
+def prefer_full_title(section: str, a: HtmlElement) -> str:
+    visible = stripped_text(a, " ")
     title_attr = (a.get("title") or "").strip()
     if section.lower().startswith("what") and title_attr and len(title_attr) > len(visible):
         return title_attr
     return visible
 
-def try_extract_datetime(a: Tag) -> Optional[datetime]:
+def _parse_dt(s: str) -> datetime:
+    """
+    datetime.fromisoformat (C builtin) for the ISO strings most timestamps are, dateutil only for the rest.
+    A string without a single digit isn't a timestamp, so it fails without trying dateutil.
+    """
+    try:
+        return datetime.fromisoformat(s)
+    except (TypeError, ValueError):
+        pass
+    if not _DIGIT_RE.search(s):
+        raise ValueError(f"no date in {s!r}")
+    return dateparser.parse(s)
+
+def try_extract_datetime(a: HtmlElement) -> Optional[datetime]:
     """
     Try to find a timestamp near the link:
     - <time datetime="..."> or title/text inside a <time> tag
     - data-time / data-ts / datetime / title attributes on the anchor or parent
     - ISO-like date in nearby text
     """
-    tz = ZoneInfo(TIMEZONE)
+    tz = _TZ
 
     # <time> next to the link
-    time_tag = a.find_next("time")
-    if isinstance(time_tag, Tag):
-        for candidate in (time_tag.get("datetime"), time_tag.get("title"), time_tag.get_text(strip=True)):
+    time_tag = _first_of(a, _NEXT_TIME)
+    if time_tag is not None:
+        for candidate in (time_tag.get("datetime"), time_tag.get("title"), stripped_text(time_tag)):
             if candidate:
                 try:
-                    return dateparser.parse(candidate).astimezone(tz)
+                    return _parse_dt(candidate).astimezone(tz)
                 except Exception:
                     pass
 
     # Attributes on anchor or its parent
-    for node in (a, a.parent if isinstance(a.parent, Tag) else None):
-        if not isinstance(node, Tag):
+    parent = a.getparent()
+    for node in (a, parent):
+        if node is None:
             continue
-        for key in ("data-time", "data-ts", "data-timestamp", "data-pubdate", "datetime", "title"):
+        for key in _DT_ATTR_KEYS:
             val = node.get(key)
             if val:
                 try:
-                    return dateparser.parse(val).astimezone(tz)
+                    return _parse_dt(val).astimezone(tz)
                 except Exception:
                     continue
 
     # ISO-like date in nearby text
     neighborhood = " ".join(filter(None, [
-        a.parent.get_text(" ", strip=True) if isinstance(a.parent, Tag) else "",
-        a.find_next(string=True) or ""
+        stripped_text(parent, " ") if parent is not None else "",
+        _first_of(a, _NEXT_TEXT) or ""
     ]))
-    m = re.search(r"\b\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2})?)?", neighborhood)
+    m = _ISO_DATE_RE.search(neighborhood)
     if m:
         try:
-            return dateparser.parse(m.group(0)).astimezone(tz)
+            return _parse_dt(m.group(0)).astimezone(tz)
         except Exception:
             pass
 
     return None
 
+def filter_today(results: Dict[str, List[Item]], today: Optional[date] = None) -> Dict[str, List[Item]]:
+    """
+    If any item carries a date, keep only the ones published today (in TIMEZONE) and drop emptied sections.
+    With no dates at all there is nothing to filter on, so results come back as they are.
+    """
+    if not any(it.published for items in results.values() for it in items):
+        return results
+    if today is None:
+        today = datetime.now(_TZ).date()
+    filtered = {
+        section: [it for it in items if it.published and datetime.fromisoformat(it.published).date() == today]
+        for section, items in results.items()
+    }
+    # drop empty sections
+    return {s: lst for s, lst in filtered.items() if lst}
+
 def get_today_titles_skimfeed(only_today_if_possible: bool = True) -> Dict[str, List[Item]]:
-    soup = BeautifulSoup(fetch(URL).text, "lxml")
-    today = datetime.now(ZoneInfo(TIMEZONE)).date()
+    tree = parse_response(fetch(URL))
+    today = datetime.now(_TZ).date()
 
     results: Dict[str, List[Item]] = {}
     seen = set()
 
     # KEY CHANGE: target anchors that are list items
-    for a in soup.select("li > a[href]"):
+    # One walk in document order: the last heading seen is the section of every
+    # li > a[href] after it (its closest enclosing or preceding h1-h4, without climbing back per anchor)
+    section = "Uncategorized"
+    for a in tree.iter(etree.Element):
+        if a.tag in _HEADINGS:
+            section = normalize_section_name(stripped_text(a, " "))
+            continue
+        if a.tag != "a" or "href" not in a.attrib:
+            continue
+        parent = a.getparent()
+        if parent is None or parent.tag != "li":
+            continue
         #print((a.get("title") or "").strip())  # Debugging line to see the anchors being processed
         #href = a["href"].strip()
         #if not is_external(href):
         #    continue
 
-        section = nearest_section_heading(a)
         title = (a.get("title") or "").strip()
         #title = prefer_full_title(section, a)
 
@@ -137,12 +210,6 @@ def get_today_titles_skimfeed(only_today_if_possible: bool = True) -> Dict[str,
 
     # If we found any real dates, optionally keep only "today" in your tz.
     if only_today_if_possible:
-        any_dated = any(it.published for items in results.values() for it in items)
-        if any_dated:
-            for section, items in list(results.items()):
-                filtered = [it for it in items if it.published and datetime.fromisoformat(it.published).date() == today]
-                results[section] = filtered
-            # drop empty sections
-            results = {s: lst for s, lst in results.items() if lst}
+        results = filter_today(results, today)
 
     return results
\ No newline at end of file
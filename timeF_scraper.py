@@ -3,7 +3,9 @@ import re
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import requests
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+from scraping_helpers import stripped_text
 
 
 USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124 Safari/537.36"
@@ -12,15 +14,19 @@ URL = "https://timef.com/business/"
 
 DATE_RE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\s+\d{2}:\d{2}:\d{2}\b")
 DOMAIN_LIKE_RE = re.compile(r"^[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+# only text nodes that could hold a DATE_RE timestamp (needs both "-" and ":") come back to Python
+_TEXT_NODES = etree.XPath("//text()[contains(., '-') and contains(., ':')]")
 
 def is_domain_text(text: str) -> bool:
     return bool(DOMAIN_LIKE_RE.fullmatch(text.strip()))
 
 def pick_title_anchor(container):
     """Pick the first external-link anchor that looks like a headline (not a bare domain)."""
-    for a in container.find_all("a", href=True):
-        href = a["href"]
-        txt = a.get_text(strip=True)
+    for a in container.iterdescendants("a"):
+        href = a.get("href")
+        if href is None:
+            continue
+        txt = stripped_text(a)
         if "timef.com" in href:
             continue
         if not txt or is_domain_text(txt):
@@ -32,15 +38,22 @@ def pick_title_anchor(container):
 def get_today_titles_timeF(tz="Europe/Paris"):
     today_str = datetime.now(ZoneInfo(tz)).date().isoformat()  # e.g., "2025-08-20"
 
-    r = requests.get(URL, headers={"User-Agent": USER_AGENT}, timeout=20)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "lxml")
+    # streamed straight into lxml instead of materializing r.text first
+    r = requests.get(URL, headers={"User-Agent": USER_AGENT}, timeout=20, stream=True)
+    try:
+        r.raise_for_status()
+        r.raw.decode_content = True
+        parser = lxml.html.HTMLParser(encoding=r.encoding) if r.encoding else None
+        tree = lxml.html.parse(r.raw, parser=parser).getroot()
+    finally:
+        r.close()
 
     results = []
     seen = set()
+    picked = {}  # container -> its title anchor (or None): neighbouring timestamps climb into the same blocks
 
     # Find the timestamp strings anywhere in the page, then climb to a container to find the title link.
-    for s in soup.find_all(string=DATE_RE):
+    for s in _TEXT_NODES(tree):
         m = DATE_RE.search(s)
         if not m:
             continue
@@ -50,19 +63,24 @@ def get_today_titles_timeF(tz="Europe/Paris"):
             continue
 
         # Walk up a few levels to find a block that contains the headline link.
-        node = s.parent
+        # a tail string belongs to the element it follows, so its container is one level further up
+        node = s.getparent()
+        if s.is_tail and node is not None:
+            node = node.getparent()
         for _ in range(4):  # limited climb to stay safe
-            if not node:
+            if node is None:
                 break
-            a = pick_title_anchor(node)
-            if a:
-                title = a.get_text(strip=True)
-                url = a["href"]
+            if node not in picked:
+                picked[node] = pick_title_anchor(node)
+            a = picked[node]
+            if a is not None:
+                title = stripped_text(a)
+                url = a.get("href")
                 key = (title, url)
                 if key not in seen:
                     seen.add(key)
                     results.append({"date": date_full, "title": title, "url": url})
                 break
-            node = node.parent
+            node = node.getparent()
 
     return results
\ No newline at end of file